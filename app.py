@@ -1,9 +1,94 @@
-import gradio as gr
-import uuid
+import array
+import collections
+import collections.abc
 import datetime
+import enum
+import heapq
+import itertools
+import logging
+import math
+import operator
+import time
+
+logger = logging.getLogger(__name__)
+
+_now = time.time
+_fromtimestamp = datetime.datetime.fromtimestamp
+
+Transaction = collections.namedtuple("Transaction", ("timestamp", "type", "amount"))
+
+
+class AccountType(enum.IntEnum):
+    SAVINGS = 0
+    CHECKING = 1
+
+
+_ACCT_TYPE = {"Savings": AccountType.SAVINGS, "Checking": AccountType.CHECKING}
+_ACCT_TYPE_NAMES = ("Savings", "Checking")
+
+_SEP = "-" * 30
+_HIST_HEADER = f"{_SEP}\nTransaction History 📜:\n{_SEP}"
+_LIST_HEADER = f"{_SEP}\nList of All Accounts 🧾:\n{_SEP}"
+
+_DEPOSIT, _WITHDRAWAL = 0, 1
+_MAX_CENTS = 2**63 - 1  # largest amount array("q") can record
+_TYPES = ("Deposit", "Withdrawal")
+
+
+_today_cache = [None, 0.0, 0.0]  # [date, filled_at, expires_at]
+
+
+def _today():
+    now = _now()
+    if not _today_cache[1] <= now < _today_cache[2]:
+        today = datetime.date.today()
+        midnight = datetime.datetime.combine(
+            today + datetime.timedelta(days=1), datetime.time.min
+        ).timestamp()
+        _today_cache[:] = [today, now, min(now + 60, midnight)]
+    return _today_cache[0]
+
+
+def _parse_account_number(account_number):
+    if type(account_number) is int:
+        return account_number
+    if isinstance(account_number, str):
+        try:
+            return int(account_number)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_cents(amount):
+    if isinstance(amount, int):
+        return amount * 100
+    try:
+        scaled = float(amount) * 100
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return round(scaled) if math.isfinite(scaled) else None
+
+
+def _money(cents):
+    sign = "-" if cents < 0 else ""
+    d, c = divmod(abs(cents), 100)
+    return f"{sign}{d}.{c:02d}"
 
 
 class BankAccount:
+    __slots__ = (
+        "account_number",
+        "account_holder_name",
+        "_balance_cents",
+        "account_type",
+        "creation_date",
+        "_tx_ts",
+        "_tx_type",
+        "_tx_amt",
+    )
+    _counter = itertools.count(1)
+
     def __init__(
         self, account_holder_name, initial_balance=0.0, account_type="Savings"
     ):
@@ -11,260 +96,424 @@ class BankAccount:
             raise TypeError("Initial balance must be a number.")
         if initial_balance < 0:
             raise ValueError("Initial balance cannot be negative.")
-
-        self.account_number = str(uuid.uuid4())
+        balance_cents = _to_cents(initial_balance)
+        if balance_cents is None:
+            raise ValueError("Initial balance must be a finite number.")
+        if balance_cents > _MAX_CENTS:
+            raise ValueError("Initial balance exceeds the maximum balance.")
+        if not isinstance(account_type, AccountType):
+            try:
+                account_type = _ACCT_TYPE[account_type]
+            except KeyError:
+                raise ValueError(f"Unknown account type: {account_type}.") from None
+
+        self.account_number = next(BankAccount._counter)
         self.account_holder_name = account_holder_name
-        self.balance = initial_balance
+        self._balance_cents = balance_cents
         self.account_type = account_type
-        self.transactions = []
-        self.creation_date = datetime.date.today()
+        self.creation_date = _today()
+        self._tx_ts = array.array("d")
+        self._tx_type = bytearray()
+        self._tx_amt = array.array("q")
+
+    def _prepare(self, code, amount):
+        label = _TYPES[code]
+        try:
+            amount_cents = round(amount * 100)
+        except TypeError:
+            return None, f"{label} amount must be a number."
+        except (ValueError, OverflowError):
+            return None, f"{label} amount must be a finite number."
+        if amount_cents <= 0:
+            return None, f"{label} amount must be positive."
+        if code == _DEPOSIT:
+            if amount_cents > _MAX_CENTS - self._balance_cents:
+                return None, "Deposit would exceed the maximum balance."
+        elif amount_cents > self._balance_cents:
+            return None, "Insufficient funds."
+        return amount_cents, None
 
     def deposit(self, amount):
         if not isinstance(amount, (int, float)):
             raise TypeError("Deposit amount must be a number.")
-        if amount <= 0:
-            raise ValueError("Deposit amount must be positive.")
-
-        self.balance += amount
-        self._add_transaction("Deposit", amount)
-        return f"Deposited ${amount:.2f} 💰. New balance: ${self.balance:.2f}"
+        amount_cents, error = self._prepare(_DEPOSIT, amount)
+        if error:
+            raise ValueError(error)
+        return self._deposit_unchecked(amount_cents)
+
+    def try_deposit(self, amount):
+        amount_cents, error = self._prepare(_DEPOSIT, amount)
+        return error or self._deposit_unchecked(amount_cents)
+
+    def _deposit_unchecked(self, amount_cents):
+        self._add_transaction(_DEPOSIT, amount_cents)
+        self._balance_cents += amount_cents
+        return (
+            f"Deposited ${_money(amount_cents)} 💰. "
+            f"New balance: ${_money(self._balance_cents)}"
+        )
 
     def withdraw(self, amount):
         if not isinstance(amount, (int, float)):
             raise TypeError("Withdrawal amount must be a number.")
-        if amount <= 0:
-            raise ValueError("Withdrawal amount must be positive.")
-        if amount > self.balance:
-            raise ValueError("Insufficient funds.")
+        amount_cents, error = self._prepare(_WITHDRAWAL, amount)
+        if error:
+            raise ValueError(error)
+        return self._withdraw_unchecked(amount_cents)
+
+    def try_withdraw(self, amount):
+        amount_cents, error = self._prepare(_WITHDRAWAL, amount)
+        return error or self._withdraw_unchecked(amount_cents)
+
+    def _withdraw_unchecked(self, amount_cents):
+        self._add_transaction(_WITHDRAWAL, -amount_cents)
+        self._balance_cents -= amount_cents
+        return (
+            f"Withdrew ${_money(amount_cents)} 💸. "
+            f"New balance: ${_money(self._balance_cents)}"
+        )
 
-        self.balance -= amount
-        self._add_transaction("Withdrawal", -amount)
-        return f"Withdrew ${amount:.2f} 💸. New balance: ${self.balance:.2f}"
+    @property
+    def balance(self):
+        return self._balance_cents / 100
 
     def get_balance(self):
-        return f"Current balance: ${self.balance:.2f} ⚖️"
+        return f"Current balance: ${_money(self._balance_cents)} ⚖️"
 
     def get_account_details(self):
-        details = f"Account Number: {self.account_number}\n"
-        details += f"Account Holder: {self.account_holder_name}\n"
-        details += f"Account Type: {self.account_type}\n"
-        details += f"Balance: ${self.balance:.2f}\n"
-        details += f"Creation Date: {self.creation_date}\n"
-        return details
-
-    def _add_transaction(self, transaction_type, amount):
-        timestamp = datetime.datetime.now()
-        self.transactions.append(
-            {"timestamp": timestamp, "type": transaction_type, "amount": amount}
+        return (
+            f"Account Number: {self.account_number}\n"
+            f"Account Holder: {self.account_holder_name}\n"
+            f"Account Type: {_ACCT_TYPE_NAMES[self.account_type]}\n"
+            f"Balance: ${_money(self._balance_cents)}\n"
+            f"Creation Date: {self.creation_date}\n"
         )
 
+    @property
+    def transactions(self):
+        return [
+            Transaction(timestamp, _TYPES[code], amount / 100)
+            for timestamp, code, amount in zip(self._tx_ts, self._tx_type, self._tx_amt)
+        ]
+
+    def _add_transaction(self, code, amount_cents):
+        self._tx_amt.append(amount_cents)
+        self._tx_type.append(code)
+        self._tx_ts.append(_now())
+
     def get_transaction_history(self):
-        if not self.transactions:
+        if not self._tx_type:
             return "No transactions yet."
 
-        history = "-" * 30 + "\nTransaction History 📜:\n" + "-" * 30 + "\n"
-        for transaction in self.transactions:
-            history += (
-                f"{transaction['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} - "
-                f"{transaction['type']:<10}: ${transaction['amount']:>8.2f}\n"
+        parts = [_HIST_HEADER]
+        for timestamp, code, amount in zip(self._tx_ts, self._tx_type, self._tx_amt):
+            parts.append(
+                f"{_fromtimestamp(timestamp):%Y-%m-%d %H:%M:%S} - "
+                f"{_TYPES[code]:<10}: ${_money(amount):>8}"
             )
-        history += "-" * 30
-        return history
+        parts.append(_SEP)
+        return "\n".join(parts)
+
+
+_NUM_SHARDS = 8
+
+
+def _shard_for(shards, account_number):
+    return shards[hash(account_number) & (_NUM_SHARDS - 1)]
+
+
+class _AccountsView(collections.abc.Mapping):
+    """Read-only, non-copying view over a BankingSystem's account shards."""
+
+    __slots__ = ("_shards",)
+
+    def __init__(self, shards):
+        self._shards = shards
+
+    def _bucket(self, account_number):
+        return _shard_for(self._shards, account_number)
+
+    def __getitem__(self, account_number):
+        return self._bucket(account_number)[account_number]
+
+    def __contains__(self, account_number):
+        return account_number in self._bucket(account_number)
+
+    def __len__(self):
+        return sum(map(len, self._shards))
+
+    def __iter__(self):
+        for shard in self._shards:
+            yield from shard
 
 
 class BankingSystem:
+    __slots__ = ("_shards", "_last")
+
     def __init__(self):
-        self.accounts = {}
+        self._shards = tuple({} for _ in range(_NUM_SHARDS))
+        self._last = (None, None)
+
+    def _bucket(self, account_number):
+        return _shard_for(self._shards, account_number)
+
+    @property
+    def accounts(self):
+        return _AccountsView(self._shards)
+
+    def _snapshot(self):
+        # Ids are handed out in increasing order, so each shard is already
+        # sorted by insertion; merging them restores creation order.
+        return list(
+            heapq.merge(
+                *[list(shard.values()) for shard in self._shards],
+                key=operator.attrgetter("account_number"),
+            )
+        )
 
     def create_account(
         self, account_holder_name, initial_balance=0.0, account_type="Savings"
     ):
         try:
             account = BankAccount(account_holder_name, initial_balance, account_type)
-            self.accounts[account.account_number] = account
-            return f"Account created successfully 🏦. Account number: {account.account_number}"
+            acct_id = account.account_number
+            self._bucket(acct_id)[acct_id] = account
+            self._last = (acct_id, account)
+            return f"Account created successfully 🏦. Account number: {acct_id}"
         except (TypeError, ValueError) as e:
             return f"Account creation failed: {e}"
 
     def get_account(self, account_number):
-        return self.accounts.get(account_number)
+        if type(account_number) is not int:
+            account_number = _parse_account_number(account_number)
+            if account_number is None:
+                return None
+        last_number, last_account = self._last
+        if account_number == last_number:
+            return last_account
+        account = self._bucket(account_number).get(account_number)
+        self._last = (account_number, account)
+        return account
 
     def delete_account(self, account_number):
-        if account_number in self.accounts:
-            del self.accounts[account_number]
+        acct_id = _parse_account_number(account_number)
+        if acct_id is None:
+            return f"Account {account_number} not found."
+        self._last = (None, None)
+        if self._bucket(acct_id).pop(acct_id, None) is not None:
             return f"Account {account_number} deleted successfully 🗑️."
         else:
             return f"Account {account_number} not found."
 
     def list_all_accounts(self):
-        if not self.accounts:
+        snap = self._snapshot()
+        if not snap:
             return "No accounts in the system."
 
-        all_accounts_details = (
-            "-" * 30 + "\nList of All Accounts 🧾:\n" + "-" * 30 + "\n"
-        )
-        for account_number, account in self.accounts.items():
-            all_accounts_details += account.get_account_details() + "-" * 30 + "\n"
-        return all_accounts_details
+        parts = [_LIST_HEADER]
+        for account in snap:
+            parts.append(account.get_account_details() + _SEP)
+        return "\n".join(parts) + "\n"
 
 
 bank_system = BankingSystem()
 
 
-def create_account_ui(account_holder_name, initial_balance, account_type):
+async def create_account_ui(account_holder_name, initial_balance, account_type):
     return bank_system.create_account(
         account_holder_name, initial_balance, account_type
     )
 
 
-def deposit_ui(account_number, amount):
-    account = bank_system.get_account(account_number)
-    if account:
-        try:
-            return account.deposit(amount)
-        except (TypeError, ValueError) as e:
-            return str(e)
-    else:
+def _deposit(account_number, amount):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    account = bank_system.get_account(acct_id)
+    if not account:
         return "Account not found."
+    return account.try_deposit(amount)
 
 
-def withdraw_ui(account_number, amount):
-    account = bank_system.get_account(account_number)
-    if account:
-        try:
-            return account.withdraw(amount)
-        except (TypeError, ValueError) as e:
-            return str(e)
-    else:
+def _withdraw(account_number, amount):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    account = bank_system.get_account(acct_id)
+    if not account:
         return "Account not found."
+    return account.try_withdraw(amount)
+
+
+def _run_batch(handler, account_numbers, amounts):
+    results = []
+    for account_number, amount in zip(account_numbers, amounts):
+        try:
+            results.append(handler(account_number, amount))
+        except Exception:
+            logger.exception("Batched request for account %r failed", account_number)
+            results.append("Request failed due to an internal error.")
+    return [results]
+
+
+async def deposit_ui(account_numbers, amounts):
+    return _run_batch(_deposit, account_numbers, amounts)
+
 
+async def withdraw_ui(account_numbers, amounts):
+    return _run_batch(_withdraw, account_numbers, amounts)
 
-def check_balance_ui(account_number):
-    account = bank_system.get_account(account_number)
+
+async def check_balance_ui(account_number):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    account = bank_system.get_account(acct_id)
     if account:
         return account.get_balance()
     else:
         return "Account not found."
 
 
-def get_account_details_ui(account_number):
-    account = bank_system.get_account(account_number)
+async def get_account_details_ui(account_number):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    account = bank_system.get_account(acct_id)
     if account:
         return account.get_account_details()
     else:
         return "Account not found."
 
 
-def get_transaction_history_ui(account_number):
-    account = bank_system.get_account(account_number)
+async def get_transaction_history_ui(account_number):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    account = bank_system.get_account(acct_id)
     if account:
         return account.get_transaction_history()
     else:
         return "Account not found."
 
 
-def list_all_accounts_ui():
+async def list_all_accounts_ui():
     return bank_system.list_all_accounts()
 
 
-def delete_account_ui(account_number):
-    return bank_system.delete_account(account_number)
+async def delete_account_ui(account_number):
+    acct_id = _parse_account_number(account_number)
+    if acct_id is None:
+        return "Invalid account number."
+    return bank_system.delete_account(acct_id)
+
 
+def _run_ui():
+    import gradio as gr
 
-with gr.Blocks(
-    theme=gr.themes.Citrus(
+    theme = gr.themes.Citrus(
         font=[gr.themes.GoogleFont("Poppins"), "Arial", "sans-serif"],
         text_size=gr.themes.sizes.text_lg,
     )
-) as iface:
-    gr.Markdown("# Simple Banking System 🏦")
-
-    with gr.Tab("Create Account ➕"):
-        with gr.Row():
-            account_holder_name_input = gr.Textbox(label="Account Holder Name")
-            initial_balance_input = gr.Number(label="Initial Balance", value=0.0)
-            account_type_dropdown = gr.Dropdown(
-                ["Savings", "Checking"], label="Account Type", value="Savings"
+
+    with gr.Blocks(theme=theme) as iface:
+        gr.Markdown("# Simple Banking System 🏦")
+
+        with gr.Tab("Create Account ➕"):
+            with gr.Row():
+                account_holder_name_input = gr.Textbox(label="Account Holder Name")
+                initial_balance_input = gr.Number(label="Initial Balance", value=0.0)
+                account_type_dropdown = gr.Dropdown(
+                    ["Savings", "Checking"], label="Account Type", value="Savings"
+                )
+            create_account_button = gr.Button("Create Account ➕")
+            create_account_output = gr.Textbox(label="Output")
+            create_account_button.click(
+                create_account_ui,
+                inputs=[
+                    account_holder_name_input,
+                    initial_balance_input,
+                    account_type_dropdown,
+                ],
+                outputs=create_account_output,
             )
-        create_account_button = gr.Button("Create Account ➕")
-        create_account_output = gr.Textbox(label="Output")
-        create_account_button.click(
-            create_account_ui,
-            inputs=[
-                account_holder_name_input,
-                initial_balance_input,
-                account_type_dropdown,
-            ],
-            outputs=create_account_output,
-        )
 
-    with gr.Tab("Deposit 💰"):
-        account_number_deposit_input = gr.Textbox(label="Account Number")
-        deposit_amount_input = gr.Number(label="Deposit Amount")
-        deposit_button = gr.Button("Deposit 💰")
-        deposit_output = gr.Textbox(label="Output")
-        deposit_button.click(
-            deposit_ui,
-            inputs=[account_number_deposit_input, deposit_amount_input],
-            outputs=deposit_output,
-        )
+        with gr.Tab("Deposit 💰"):
+            account_number_deposit_input = gr.Textbox(label="Account Number")
+            deposit_amount_input = gr.Number(label="Deposit Amount")
+            deposit_button = gr.Button("Deposit 💰")
+            deposit_output = gr.Textbox(label="Output")
+            deposit_button.click(
+                deposit_ui,
+                inputs=[account_number_deposit_input, deposit_amount_input],
+                outputs=deposit_output,
+                batch=True,
+                max_batch_size=16,
+            )
 
-    with gr.Tab("Withdraw 💸"):
-        account_number_withdraw_input = gr.Textbox(label="Account Number")
-        withdraw_amount_input = gr.Number(label="Withdraw Amount")
-        withdraw_button = gr.Button("Withdraw 💸")
-        withdraw_output = gr.Textbox(label="Output")
-        withdraw_button.click(
-            withdraw_ui,
-            inputs=[account_number_withdraw_input, withdraw_amount_input],
-            outputs=withdraw_output,
-        )
+        with gr.Tab("Withdraw 💸"):
+            account_number_withdraw_input = gr.Textbox(label="Account Number")
+            withdraw_amount_input = gr.Number(label="Withdraw Amount")
+            withdraw_button = gr.Button("Withdraw 💸")
+            withdraw_output = gr.Textbox(label="Output")
+            withdraw_button.click(
+                withdraw_ui,
+                inputs=[account_number_withdraw_input, withdraw_amount_input],
+                outputs=withdraw_output,
+                batch=True,
+                max_batch_size=16,
+            )
 
-    with gr.Tab("Check Balance ⚖️"):
-        account_number_balance_input = gr.Textbox(label="Account Number")
-        check_balance_button = gr.Button("Check Balance ⚖️")
-        check_balance_output = gr.Textbox(label="Balance")
-        check_balance_button.click(
-            check_balance_ui,
-            inputs=[account_number_balance_input],
-            outputs=check_balance_output,
-        )
+        with gr.Tab("Check Balance ⚖️"):
+            account_number_balance_input = gr.Textbox(label="Account Number")
+            check_balance_button = gr.Button("Check Balance ⚖️")
+            check_balance_output = gr.Textbox(label="Balance")
+            check_balance_button.click(
+                check_balance_ui,
+                inputs=[account_number_balance_input],
+                outputs=check_balance_output,
+            )
 
-    with gr.Tab("Account Details ℹ️"):
-        account_number_details_input = gr.Textbox(label="Account Number")
-        account_details_button = gr.Button("Get Account Details ℹ️")
-        account_details_output = gr.Textbox(label="Account Details")
-        account_details_button.click(
-            get_account_details_ui,
-            inputs=[account_number_details_input],
-            outputs=account_details_output,
-        )
+        with gr.Tab("Account Details ℹ️"):
+            account_number_details_input = gr.Textbox(label="Account Number")
+            account_details_button = gr.Button("Get Account Details ℹ️")
+            account_details_output = gr.Textbox(label="Account Details")
+            account_details_button.click(
+                get_account_details_ui,
+                inputs=[account_number_details_input],
+                outputs=account_details_output,
+            )
 
-    with gr.Tab("Transaction History 📜"):
-        account_number_history_input = gr.Textbox(label="Account Number")
-        transaction_history_button = gr.Button("Show Transaction History 📜")
-        transaction_history_output = gr.Textbox(label="Transaction History")
-        transaction_history_button.click(
-            get_transaction_history_ui,
-            inputs=[account_number_history_input],
-            outputs=transaction_history_output,
-        )
+        with gr.Tab("Transaction History 📜"):
+            account_number_history_input = gr.Textbox(label="Account Number")
+            transaction_history_button = gr.Button("Show Transaction History 📜")
+            transaction_history_output = gr.Textbox(label="Transaction History")
+            transaction_history_button.click(
+                get_transaction_history_ui,
+                inputs=[account_number_history_input],
+                outputs=transaction_history_output,
+            )
 
-    with gr.Tab("List All Accounts 🧾"):
-        list_accounts_button = gr.Button("List All Accounts 🧾")
-        list_accounts_output = gr.Textbox(label="All Accounts Details")
-        list_accounts_button.click(
-            list_all_accounts_ui, inputs=[], outputs=list_accounts_output
-        )
+        with gr.Tab("List All Accounts 🧾"):
+            list_accounts_button = gr.Button("List All Accounts 🧾")
+            list_accounts_output = gr.Textbox(label="All Accounts Details")
+            list_accounts_button.click(
+                list_all_accounts_ui, inputs=[], outputs=list_accounts_output
+            )
+
+        with gr.Tab("Delete Account 🗑️"):
+            account_number_delete_input = gr.Textbox(label="Account Number to Delete")
+            delete_account_button = gr.Button("Delete Account 🗑️")
+            delete_account_output = gr.Textbox(label="Output")
+            delete_account_button.click(
+                delete_account_ui,
+                inputs=[account_number_delete_input],
+                outputs=delete_account_output,
+            )
+
+    iface.queue(default_concurrency_limit=8, max_size=64)
+    iface.launch(pwa=True)
 
-    with gr.Tab("Delete Account 🗑️"):
-        account_number_delete_input = gr.Textbox(label="Account Number to Delete")
-        delete_account_button = gr.Button("Delete Account 🗑️")
-        delete_account_output = gr.Textbox(label="Output")
-        delete_account_button.click(
-            delete_account_ui,
-            inputs=[account_number_delete_input],
-            outputs=delete_account_output,
-        )
 
-iface.launch(pwa=True)
+if __name__ == "__main__":
+    _run_ui()